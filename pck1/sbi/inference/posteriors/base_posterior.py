@@ -9,6 +9,7 @@ from warnings import warn
 
 import numpy as np
 import torch
+from joblib import Parallel, delayed
 from pyro.infer.mcmc import HMC, NUTS
 from pyro.infer.mcmc.api import MCMC
 from torch import Tensor, float32
@@ -380,6 +381,36 @@ class NeuralPosterior(ABC):
 
         return self
 
+    def snapshot(self, device: Optional[str] = "cpu") -> "NeuralPosterior":
+        """
+        Return a copy of the posterior to be kept, e.g. in a model bank.
+
+        Like a `deepcopy`, the copy shares no state with the posterior. Unlike a
+        `deepcopy`, the copy of the net is moved to `device` and put into eval mode,
+        and attributes that are dropped for pickling, e.g. caches, are not copied.
+        Moving the net happens after copying, i.e. the copy is briefly on the device
+        of the net.
+
+        Args:
+            device: Device the copy of the net is moved to. If `None`, it stays on the
+                device of the net.
+
+        Returns:
+            Copy of the posterior.
+        """
+        snapshot = self.__class__.__new__(self.__class__)
+        # References to the posterior, e.g. held by its VI optimizer, point to the
+        # snapshot in the copy. One memo is used for all attributes, such that objects
+        # shared between them are also shared between their copies.
+        memo = {id(self): snapshot}
+        attributes = deepcopy(self.__getstate__(), memo)
+        snapshot.__dict__.update(attributes)
+        if device is not None:
+            snapshot.net.to(device)
+        snapshot.net.eval()
+
+        return snapshot
+
     def _prepare_theta_and_x_for_log_prob_(
         self, theta: Tensor, x: Optional[Tensor] = None
     ) -> Tuple[Tensor, Tensor]:
@@ -520,6 +551,7 @@ class NeuralPosterior(ABC):
         thin: int = 10,
         warmup_steps: int = 20,
         num_chains: Optional[int] = 1,
+        num_workers: int = 1,
         show_progress_bars: bool = True,
         **kwargs,
     ) -> Tensor:
@@ -542,6 +574,8 @@ class NeuralPosterior(ABC):
                 sample will be returned, until a total of `num_samples`.
             warmup_steps: Initial number of samples to discard.
             num_chains: Whether to sample in parallel. If None, use all but one CPU.
+            num_workers: Number of CPU processes the chains of `slice_np` are
+                distributed across. Each chain uses its own random number generator.
             show_progress_bars: Whether to show a progressbar during sampling.
             kwargs: Absorbs passed but unused arguments. E.g. in
                 `DirectPosterior.sample()` we pass `mcmc_parameters` which might
@@ -564,6 +598,7 @@ class NeuralPosterior(ABC):
                     thin=thin,
                     warmup_steps=warmup_steps,
                     vectorized=(mcmc_method == "slice_np_vectorized"),
+                    num_workers=num_workers,
                     show_progress_bars=show_progress_bars,
                 )
             elif mcmc_method in ("hmc", "nuts", "slice"):
@@ -590,6 +625,7 @@ class NeuralPosterior(ABC):
         thin: int,
         warmup_steps: int,
         vectorized: bool = False,
+        num_workers: int = 1,
         show_progress_bars: bool = True,
     ) -> Tensor:
         """
@@ -603,6 +639,9 @@ class NeuralPosterior(ABC):
             warmup_steps: Initial number of samples to discard.
             vectorized: Whether to use a vectorized implementation of
                 the Slice sampler (still experimental).
+            num_workers: Number of CPU processes the chains are distributed across
+                (only for the non-vectorized sampler). Each chain is seeded from the
+                torch random number generator.
             show_progress_bars: Whether to show a progressbar during sampling;
                 can only be turned off for vectorized sampler.
 
@@ -611,19 +650,33 @@ class NeuralPosterior(ABC):
         num_chains = initial_params.shape[0]
         dim_samples = initial_params.shape[1]
 
-        if not vectorized:  # Sample all chains sequentially
-            all_samples = []
-            for c in range(num_chains):
-                posterior_sampler = SliceSampler(
-                    utils.tensor2numpy(initial_params[c, :]).reshape(-1),
-                    lp_f=potential_function,
+        if not vectorized and num_workers > 1:  # Sample chains in parallel
+            seeds = torch.randint(high=2 ** 31, size=(num_chains,)).tolist()
+            all_samples = Parallel(n_jobs=num_workers)(
+                delayed(_run_slice_np_chain)(
+                    initial_params=utils.tensor2numpy(initial_params[c, :]),
+                    potential_function=potential_function,
+                    num_samples=ceil(num_samples / num_chains),
                     thin=thin,
-                    verbose=show_progress_bars,
+                    warmup_steps=warmup_steps,
+                    seed=seeds[c],
                 )
-                if warmup_steps > 0:
-                    posterior_sampler.gen(int(warmup_steps))
+                for c in range(num_chains)
+            )
+            all_samples = np.stack(all_samples).astype(np.float32)
+            samples = torch.from_numpy(all_samples)  # chains x samples x dim
+        elif not vectorized:  # Sample all chains sequentially
+            all_samples = []
+            for c in range(num_chains):
                 all_samples.append(
-                    posterior_sampler.gen(ceil(num_samples / num_chains))
+                    _run_slice_np_chain(
+                        initial_params=utils.tensor2numpy(initial_params[c, :]),
+                        potential_function=potential_function,
+                        num_samples=ceil(num_samples / num_chains),
+                        thin=thin,
+                        warmup_steps=warmup_steps,
+                        show_progress_bars=show_progress_bars,
+                    )
                 )
             all_samples = np.stack(all_samples).astype(np.float32)
             samples = torch.from_numpy(all_samples)  # chains x samples x dim
@@ -944,7 +997,11 @@ class NeuralPosterior(ABC):
         if init_strategy == "prior":
             return lambda: prior_init(prior, **kwargs)
         elif init_strategy == "sir":
-            return lambda: sir(prior, potential_fn, **kwargs)
+            # Resample the inits of all chains from one set of candidates.
+            num_chains = kwargs.get("num_chains") or 1
+            return IterateParameters(
+                sir(prior, potential_fn, num_samples=num_chains, **kwargs), **kwargs
+            )
         elif init_strategy == "latest_sample":
             latest_sample = IterateParameters(self._mcmc_init_params, **kwargs)
             return latest_sample
@@ -1161,6 +1218,46 @@ class NeuralPosterior(ABC):
         self.__dict__ = state_dict
 
 
+def _run_slice_np_chain(
+    initial_params: np.ndarray,
+    potential_function: Callable,
+    num_samples: int,
+    thin: int,
+    warmup_steps: int,
+    seed: Optional[int] = None,
+    show_progress_bars: bool = False,
+) -> np.ndarray:
+    """
+    Return samples of a single chain of the numpy slice sampler.
+
+    This is a module-level function such that it can be sent to worker processes.
+
+    Args:
+        initial_params: Initial parameters of the chain.
+        potential_function: A callable **class**, picklable for use across processes.
+        num_samples: Number of samples to return after warmup.
+        thin: Thinning (subsampling) factor.
+        warmup_steps: Initial number of samples to discard.
+        seed: Seed of the random number generator of the chain. If `None`, the global
+            numpy random number generator is used.
+        show_progress_bars: Whether to show a progressbar during sampling.
+
+    Returns: Array of shape (num_samples, shape_of_single_theta).
+    """
+    rng = np.random if seed is None else np.random.RandomState(seed)
+
+    posterior_sampler = SliceSampler(
+        initial_params.reshape(-1),
+        lp_f=potential_function,
+        thin=thin,
+        verbose=show_progress_bars,
+    )
+    if warmup_steps > 0:
+        posterior_sampler.gen(int(warmup_steps), rng=rng)
+
+    return posterior_sampler.gen(num_samples, rng=rng)
+
+
 class ConditionalPotentialFunctionProvider:
     """
     Wraps the potential functions to allow for sampling from the conditional posterior.
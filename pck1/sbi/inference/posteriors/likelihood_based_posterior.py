@@ -1,9 +1,10 @@
 # This file is part of sbi, a toolkit for simulation-based inference. sbi is licensed
 # under the Affero General Public License v3, see <https://www.gnu.org/licenses/>.
 
+from contextlib import nullcontext
 from copy import deepcopy
-from functools import partial
-from typing import Any, Callable, Dict, List, Optional, Union
+from functools import lru_cache, partial
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 from warnings import warn
 
 import numpy as np
@@ -20,6 +21,12 @@ from sbi.utils.torchutils import (
     atleast_2d_float32_tensor,
 )
 
+try:
+    from torch.ao.quantization import quantize_dynamic
+except ImportError:
+    # torch<1.10
+    from torch.quantization import quantize_dynamic
+
 from sbi.vi.sampling import (
     importance_resampling,
     independent_mh,
@@ -51,6 +58,8 @@ class LikelihoodBasedPosterior(NeuralPosterior):
         rejection_sampling_parameters: Optional[Dict[str, Any]] = None,
         vi_parameters: Optional[Dict[str, Any]] = None,
         device: str = "cpu",
+        inference_dtype: Optional[torch.dtype] = None,
+        use_int8_sampling: bool = False,
     ):
         """
         Args:
@@ -65,18 +74,25 @@ class LikelihoodBasedPosterior(NeuralPosterior):
                 experimental condations.
             sample_with: Method to use for sampling from the posterior. Must be one of
                 [`mcmc` | `rejection`].
-            mcmc_method: Method used for MCMC sampling, one of `slice_np`, `slice`,
-                `hmc`, `nuts`. Currently defaults to `slice_np` for a custom numpy
-                implementation of slice sampling; select `hmc`, `nuts` or `slice` for
+            mcmc_method: Method used for MCMC sampling, one of `slice_np`,
+                `slice_np_vectorized`, `slice`, `hmc`, `nuts`. Currently defaults to
+                `slice_np` for a custom numpy implementation of slice sampling; select
+                `slice_np_vectorized` to evaluate the likelihood of all chains in a
+                single forward pass of the network, or `hmc`, `nuts` or `slice` for
                 Pyro-based sampling.
             mcmc_parameters: Dictionary overriding the default parameters for MCMC.
                 The following parameters are supported: `thin` to set the thinning
                 factor for the chain, `warmup_steps` to set the initial number of
                 samples to discard, `num_chains` for the number of chains,
-                `init_strategy` for the initialisation strategy for chains; `prior`
-                will draw init locations from prior, whereas `sir` will use Sequential-
-                Importance-Resampling using `init_strategy_num_candidates` to find init
-                locations.
+                `num_workers` for the number of processes the chains of `slice_np` are
+                distributed across, `init_strategy` for the initialisation strategy for
+                chains; `prior` will draw init locations from prior, whereas `sir` will
+                use Sequential-Importance-Resampling using
+                `init_strategy_num_candidates` to find init locations. `cuda_graph` to
+                capture the potential of `slice_np` and `slice_np_vectorized` as a CUDA
+                graph which is replayed in every step if the net lives on a GPU.
+                `compile_potential` to compile the potential of these samplers with
+                `torch.compile` (requires torch>=2.0).
             rejection_sampling_parameters: Dictionary overriding the default parameters
                 for rejection sampling. The following parameters are supported:
                 `proposal` as the proposal distribtution (default is the prior).
@@ -89,11 +105,31 @@ class LikelihoodBasedPosterior(NeuralPosterior):
             vi_parameters: Dictionary overriding the default parameters for Variational
                 Inference TODO write docstring when fixed
             device: Training device, e.g., cpu or cuda:0.
+            inference_dtype: If set, e.g. to `torch.bfloat16`, the neural net is
+                evaluated in this reduced precision (via `torch.autocast`) during
+                MCMC. The log-likelihoods are summed over trials and added to the prior
+                in single precision. Requires torch>=1.10.
+            use_int8_sampling: Whether to evaluate a copy of the neural net with
+                dynamically int8-quantized `nn.Linear` layers during gradient-free MCMC
+                (`slice_np`, `slice_np_vectorized` and `slice`) on the cpu. The
+                log-likelihoods are only approximate. Masked layers of autoregressive
+                flows are subclasses of `nn.Linear` and are not quantized. The copy is
+                quantized once per `.net` object and reused; it is not updated when
+                the weights of `.net` are changed in place, e.g. with
+                `load_state_dict()`, until a new net is assigned to `.net`.
         """
 
-        kwargs = del_entries(locals(), entries=("self", "__class__"))
+        kwargs = del_entries(
+            locals(),
+            entries=("self", "__class__", "inference_dtype", "use_int8_sampling"),
+        )
         super().__init__(**kwargs)
 
+        self._inference_dtype = inference_dtype
+        self._use_int8_sampling = use_int8_sampling
+        # Quantized copy of the net, together with the net that it was quantized from.
+        self._int8_net = None
+
         self._purpose = (
             "It provides MCMC to .sample() from the posterior and "
             "can evaluate the _unnormalized_ posterior density with .log_prob()."
@@ -127,18 +163,19 @@ class LikelihoodBasedPosterior(NeuralPosterior):
 
         if self.sample_with == "mcmc" or self.sample_with == "rejection":
             # Calculate likelihood over trials and in one batch.
-            warn(
-                "The log probability from SNL is only correct up to a normalizing constant."
-            )
-            log_likelihood_trial_sum = self._log_likelihoods_over_trials(
-                x=x.to(self._device),
-                theta=theta.to(self._device),
-                net=self.net,
-                track_gradients=track_gradients,
-            )
+            _warn_unnormalized_log_prob()
+            with _inference_mode(not track_gradients):
+                log_likelihood_trial_sum = self._log_likelihoods_over_trials(
+                    x=x.to(self._device),
+                    theta=theta.to(self._device),
+                    net=self.net,
+                    track_gradients=track_gradients,
+                )
+
+                # Move to cpu for comparison with prior.
+                log_prob = log_likelihood_trial_sum.cpu() + self._prior.log_prob(theta)
 
-            # Move to cpu for comparison with prior.
-            return log_likelihood_trial_sum.cpu() + self._prior.log_prob(theta)
+            return _clone_if_inference(log_prob)
         elif self.sample_with == "vi":
             with torch.set_grad_enabled(track_gradients):
                 return self._q.log_prob(theta.to(self._device))
@@ -175,10 +212,15 @@ class LikelihoodBasedPosterior(NeuralPosterior):
                 The following parameters are supported: `thin` to set the thinning
                 factor for the chain, `warmup_steps` to set the initial number of
                 samples to discard, `num_chains` for the number of chains,
-                `init_strategy` for the initialisation strategy for chains; `prior`
-                will draw init locations from prior, whereas `sir` will use Sequential-
-                Importance-Resampling using `init_strategy_num_candidates` to find init
-                locations.
+                `num_workers` for the number of processes the chains of `slice_np` are
+                distributed across, `init_strategy` for the initialisation strategy for
+                chains; `prior` will draw init locations from prior, whereas `sir` will
+                use Sequential-Importance-Resampling using
+                `init_strategy_num_candidates` to find init locations. `cuda_graph` to
+                capture the potential of `slice_np` and `slice_np_vectorized` as a CUDA
+                graph which is replayed in every step if the net lives on a GPU.
+                `compile_potential` to compile the potential of these samplers with
+                `torch.compile` (requires torch>=2.0).
             rejection_sampling_parameters: Dictionary overriding the default parameters
                 for rejection sampling. The following parameters are supported:
                 `proposal` as the proposal distribtution (default is the prior).
@@ -201,26 +243,44 @@ class LikelihoodBasedPosterior(NeuralPosterior):
         x, num_samples = self._prepare_for_sample(x, sample_shape)
 
         potential_fn_provider = PotentialFunctionProvider()
+        # The init strategy gets its own provider, such that it doesn't overwrite the
+        # options of the MCMC potential.
+        init_potential_fn_provider = PotentialFunctionProvider()
         if sample_with == "mcmc":
 
             mcmc_method, mcmc_parameters = self._potentially_replace_mcmc_parameters(
                 mcmc_method, mcmc_parameters
             )
 
-            samples = self._sample_posterior_mcmc(
-                num_samples=num_samples,
-                potential_fn=potential_fn_provider(
-                    self._prior, self.net, x, mcmc_method
-                ),
-                init_fn=self._build_mcmc_init_fn(
-                    self._prior,
-                    potential_fn_provider(self._prior, self.net, x, "slice_np"),
+            net = self._mcmc_net(mcmc_method)
+            # Gradient-free samplers don't need autograd bookkeeping at all.
+            with self._autocast_potential(), _inference_mode(
+                mcmc_method not in ("hmc", "nuts")
+            ):
+                samples = self._sample_posterior_mcmc(
+                    num_samples=num_samples,
+                    potential_fn=potential_fn_provider(
+                        self._prior,
+                        net,
+                        x,
+                        mcmc_method,
+                        device=self._device,
+                        cuda_graph=mcmc_parameters.get("cuda_graph", False),
+                        compile_potential=mcmc_parameters.get(
+                            "compile_potential", False
+                        ),
+                    ),
+                    init_fn=self._build_mcmc_init_fn(
+                        self._prior,
+                        init_potential_fn_provider(
+                            self._prior, net, x, "slice_np", device=self._device
+                        ),
+                        **mcmc_parameters,
+                    ),
+                    mcmc_method=mcmc_method,
+                    show_progress_bars=show_progress_bars,
                     **mcmc_parameters,
-                ),
-                mcmc_method=mcmc_method,
-                show_progress_bars=show_progress_bars,
-                **mcmc_parameters,
-            )
+                )
         elif sample_with == "rejection":
             rejection_sampling_parameters = self._potentially_replace_rejection_parameters(
                 rejection_sampling_parameters
@@ -249,12 +309,14 @@ class LikelihoodBasedPosterior(NeuralPosterior):
                     samples = self._q.sample(sample_shape)
             elif method.lower() == "ir":
                 potential_fn = potential_fn_provider(self._prior, self.net, x, "vi")
-                samples = importance_resampling(
-                    sample_shape.numel(), potential_fn=potential_fn, proposal=self._q, **method_params
-                )
+                with _inference_mode():
+                    samples = importance_resampling(
+                        sample_shape.numel(), potential_fn=potential_fn, proposal=self._q, **method_params
+                    )
             elif method.lower() == "imh":
                  potential_fn = potential_fn_provider(self._prior, self.net, x, "vi")
-                 samples = independent_mh(sample_shape.numel(), potential_fn,self._q, **method_params)
+                 with _inference_mode():
+                     samples = independent_mh(sample_shape.numel(), potential_fn,self._q, **method_params)
             elif method.lower() == "rejection":
                 rejection_sampling_parameters = self._potentially_replace_rejection_parameters(
                     rejection_sampling_parameters
@@ -269,9 +331,10 @@ class LikelihoodBasedPosterior(NeuralPosterior):
                 )
             elif method.lower() == "slice":
                 potential_fn = potential_fn_provider(self._prior, self.net, x, "vi")
-                samples = random_direction_slice_sampler(
-                    sample_shape.numel(), potential_fn, self._q, **method_params
-                )
+                with _inference_mode():
+                    samples = random_direction_slice_sampler(
+                        sample_shape.numel(), potential_fn, self._q, **method_params
+                    )
             else:
                 raise NotImplementedError("The sampling methods from the vi posterior are currently restricted to naive, ir, imh, rejection and slice")
         else:
@@ -281,6 +344,24 @@ class LikelihoodBasedPosterior(NeuralPosterior):
 
         self.net.train(True)
 
+        # Release the buffers of the potentials right away instead of keeping them
+        # cached for repeated draws. Costs a few allocations in the next call of
+        # `sample()`, but repeated draws don't accumulate device memory.
+        potential_fn_provider.clear()
+        init_potential_fn_provider.clear()
+        if torch.device(self._device).type == "cuda":
+            try:
+                torch.cuda.empty_cache()
+            except RuntimeError:
+                pass
+
+        # Samples drawn in inference mode can't be used in autograd, e.g. when they
+        # are simulated and trained on in the next round. The same holds for the
+        # last samples of the chains stored for the `latest_sample` init strategy.
+        samples = _clone_if_inference(samples)
+        if self._mcmc_init_params is not None:
+            self._mcmc_init_params = _clone_if_inference(self._mcmc_init_params)
+
         return samples.reshape((*sample_shape, -1))
 
     def sample_conditional(
@@ -326,10 +407,11 @@ class LikelihoodBasedPosterior(NeuralPosterior):
                 The following parameters are supported: `thin` to set the thinning
                 factor for the chain, `warmup_steps` to set the initial number of
                 samples to discard, `num_chains` for the number of chains,
-                `init_strategy` for the initialisation strategy for chains; `prior`
-                will draw init locations from prior, whereas `sir` will use Sequential-
-                Importance-Resampling using `init_strategy_num_candidates` to find init
-                locations.
+                `num_workers` for the number of processes the chains of `slice_np` are
+                distributed across, `init_strategy` for the initialisation strategy for
+                chains; `prior` will draw init locations from prior, whereas `sir` will
+                use Sequential-Importance-Resampling using
+                `init_strategy_num_candidates` to find init locations.
             rejection_sampling_parameters: Dictionary overriding the default parameters
                 for rejection sampling. The following parameters are supported:
                 `proposal` as the proposal distribtution (default is the prior).
@@ -418,9 +500,76 @@ class LikelihoodBasedPosterior(NeuralPosterior):
             show_progress_bars=show_progress_bars,
         )
 
+    def _autocast_potential(self):
+        """Return context in which the net is evaluated for the MCMC potential.
+
+        Autocasts to `inference_dtype` if it was set, otherwise does nothing.
+        """
+        if self._inference_dtype is None:
+            return nullcontext()
+        return torch.autocast(
+            device_type=torch.device(self._device).type, dtype=self._inference_dtype
+        )
+
+    def _mcmc_net(self, mcmc_method: str) -> nn.Module:
+        """Return the net that the potential evaluates for MCMC with `mcmc_method`.
+
+        If `use_int8_sampling` is set, this is a copy of the net with dynamically
+        int8-quantized linear layers. Quantized layers can't be differentiated, hence
+        the net is returned as is for gradient-based MCMC.
+        """
+        if not self._use_int8_sampling or mcmc_method in ("hmc", "nuts"):
+            return self.net
+        if torch.device(self._device).type != "cpu":
+            warn(
+                "int8 sampling is only supported on the cpu. The net is evaluated "
+                "without quantization."
+            )
+            return self.net
+        # The copy is only quantized again once another net was assigned. The net
+        # itself is kept as key, such that it can't be confused with a later net.
+        if self._int8_net is None or self._int8_net[0] is not self.net:
+            # Returns a quantized copy, `self.net` is left untouched.
+            self._int8_net = (
+                self.net,
+                quantize_dynamic(self.net, {nn.Linear}, dtype=torch.qint8),
+            )
+        return self._int8_net[1]
+
+    def __getstate__(self) -> Dict:
+        """
+        Returns the state of the object that is supposed to be pickled.
+
+        The quantized copy of the net is not pickled, it is recreated when needed.
+
+        Returns:
+            Dictionary containing the state.
+        """
+        return dict(super().__getstate__(), _int8_net=None)
+
+    def __setstate__(self, state_dict: Dict):
+        """
+        Sets the state when being loaded from pickle.
+
+        Posteriors pickled before `inference_dtype` and `use_int8_sampling` existed
+        evaluate the net in full precision, which is what the defaults do.
+
+        Args:
+            state_dict: State to be restored.
+        """
+        state_dict.setdefault("_inference_dtype", None)
+        state_dict.setdefault("_use_int8_sampling", False)
+        state_dict.setdefault("_int8_net", None)
+        super().__setstate__(state_dict)
+
     @staticmethod
     def _log_likelihoods_over_trials(
-        x: Tensor, theta: Tensor, net: nn.Module, track_gradients: bool = False,
+        x: Tensor,
+        theta: Tensor,
+        net: nn.Module,
+        track_gradients: bool = False,
+        x_repeated: Optional[Tensor] = None,
+        theta_repeated: Optional[Tensor] = None,
     ) -> Tensor:
         r"""Return log likelihoods summed over iid trials of `x`.
 
@@ -435,34 +584,141 @@ class LikelihoodBasedPosterior(NeuralPosterior):
             theta: batch of parameters
             net: neural net with .log_prob()
             track_gradients: Whether to track gradients.
+            x_repeated: `x` already repeated as AABBCC for the batch size of `theta`,
+                e.g. cached across the steps of a sampler. If passed, only `theta` is
+                repeated.
+            theta_repeated: `theta` already repeated as ABCABC. Only used together
+                with `x_repeated`.
 
         Returns:
             log_likelihood_trial_sum: log likelihood for each parameter, summed over all
                 batch entries (iid trials) in `x`.
         """
 
+        with torch.set_grad_enabled(track_gradients):
+            log_likelihood_trial_batch = (
+                LikelihoodBasedPosterior._log_likelihood_trial_batch(
+                    x, theta, net, track_gradients, x_repeated, theta_repeated
+                )
+            )
+            # Reshape to (x-trials x parameters), sum over trial-log likelihoods.
+            log_likelihood_trial_sum = _sum_over_trials_and_add_prior_fn()(
+                log_likelihood_trial_batch, x.shape[0], None
+            )
+
+        return log_likelihood_trial_sum
+
+    @staticmethod
+    def _log_likelihood_trial_batch(
+        x: Tensor,
+        theta: Tensor,
+        net: nn.Module,
+        track_gradients: bool = False,
+        x_repeated: Optional[Tensor] = None,
+        theta_repeated: Optional[Tensor] = None,
+    ) -> Tensor:
+        r"""Return log likelihoods for all combinations of trials in `x` and $\theta$.
+
+        Args:
+            x: batch of iid data.
+            theta: batch of parameters
+            net: neural net with .log_prob()
+            track_gradients: Whether to track gradients.
+            x_repeated: `x` already repeated as AABBCC for the batch size of `theta`.
+                If passed, only `theta` is repeated.
+            theta_repeated: `theta` already repeated as ABCABC. Only used together
+                with `x_repeated`.
+
+        Returns:
+            log_likelihood_trial_batch: log likelihoods of shape
+                `(num_trials * num_thetas,)` with the trials as the slow dimension.
+        """
+
         # Repeat `x` in case of evaluation on multiple `theta`. This is needed below in
         # when calling nflows in order to have matching shapes of theta and context x
         # at neural network evaluation time.
-        theta_repeated, x_repeated = NeuralPosterior._match_theta_and_x_batch_shapes(
-            theta=theta, x=atleast_2d(x)
-        )
+        if x.ndim > 1 and x.shape[0] == 1:
+            # A single trial needs no tiling, `x` is broadcast as a stride-0 view.
+            x_repeated = x.expand(theta.shape[0], *x.shape[1:])
+            theta_repeated = theta
+        elif x_repeated is None:
+            (
+                theta_repeated,
+                x_repeated,
+            ) = NeuralPosterior._match_theta_and_x_batch_shapes(
+                theta=theta, x=atleast_2d(x)
+            )
+        elif theta_repeated is None:
+            # Repeat theta as ABCABC.
+            theta_repeated = theta.repeat(x.shape[0], 1)
         assert (
             x_repeated.shape[0] == theta_repeated.shape[0]
         ), "x and theta must match in batch shape."
+        # The net's device is not probed here in every step. Callers move `x` and
+        # `theta` to the device of the net that they keep track of.
         assert (
-            next(net.parameters()).device == x.device and x.device == theta.device
-        ), f"device mismatch: net, x, theta: {next(net.parameters()).device}, {x.decive}, {theta.device}."
+            x.device == theta.device
+        ), f"device mismatch: x, theta: {x.device}, {theta.device}."
 
         # Calculate likelihood in one batch.
         with torch.set_grad_enabled(track_gradients):
             log_likelihood_trial_batch = net.log_prob(x_repeated, theta_repeated)
-            # Reshape to (x-trials x parameters), sum over trial-log likelihoods.
-            log_likelihood_trial_sum = log_likelihood_trial_batch.reshape(
-                x.shape[0], -1
-            ).sum(0)
+            # Sum in single precision if the net was evaluated in reduced precision.
+            if log_likelihood_trial_batch.dtype in (torch.float16, torch.bfloat16):
+                log_likelihood_trial_batch = log_likelihood_trial_batch.float()
+
+        return log_likelihood_trial_batch
+
+
+@lru_cache(maxsize=1)
+def _warn_unnormalized_log_prob() -> None:
+    """Warn once that `log_prob()` is unnormalized, not in every call of a loop."""
+    warn("The log probability from SNL is only correct up to a normalizing constant.")
+
+
+def _inference_mode(enabled: bool = True):
+    """Return `torch.inference_mode()` if `enabled`, otherwise a null context.
+
+    Falls back to `torch.no_grad()` for torch<1.9, which has no inference mode.
+    """
+    if not enabled:
+        return nullcontext()
+    return getattr(torch, "inference_mode", torch.no_grad)()
+
+
+def _clone_if_inference(t: Tensor) -> Tensor:
+    """Return a normal copy of `t` if it is an inference tensor, otherwise `t`."""
+    if getattr(t, "is_inference", lambda: False)():
+        return t.clone()
+    return t
 
-        return log_likelihood_trial_sum
+
+def _sum_over_trials_and_add_prior(
+    log_likelihood_trial_batch: Tensor, num_trials: int, log_prior: Optional[Tensor]
+) -> Tensor:
+    """Return the log likelihoods summed over iid trials, plus the log prior if given.
+
+    `log_likelihood_trial_batch` is of shape `(num_trials * batch,)` with the trials
+    in the leading dimension.
+    """
+    trial_sum = log_likelihood_trial_batch.reshape(num_trials, -1).sum(0)
+    if log_prior is None:
+        return trial_sum
+    return trial_sum + log_prior
+
+
+@lru_cache(maxsize=None)
+def _sum_over_trials_and_add_prior_fn() -> Callable:
+    """Return `_sum_over_trials_and_add_prior`, scripted on first use for torch<2.0.
+
+    On torch<2.0, it is scripted such that the reduction over trials and the addition
+    of the prior run as one fused graph instead of separate eager kernels in every
+    sampler step. TorchScript is deprecated from torch 2.0 on, where the plain function
+    is returned. It is fused by `torch.compile` if `compile_potential` is set.
+    """
+    if hasattr(torch, "compile"):
+        return _sum_over_trials_and_add_prior
+    return torch.jit.script(_sum_over_trials_and_add_prior)
 
 
 class PotentialFunctionProvider:
@@ -473,8 +729,9 @@ class PotentialFunctionProvider:
 
     NOTE: Why use a class?
     ----------------------
-    During inference, we use deepcopy to save untrained posteriors in memory. deepcopy
-    uses pickle which can't serialize nested functions
+    The potential function is sent to worker processes when chains are sampled in
+    parallel, and posteriors holding it are deepcopied when they are returned. Both
+    use pickle which can't serialize nested functions
     (https://stackoverflow.com/a/12022055).
 
     It is important to NOT initialize attributes upon instantiation, because we need the
@@ -485,7 +742,14 @@ class PotentialFunctionProvider:
     """
 
     def __call__(
-        self, prior, likelihood_nn: nn.Module, x: Tensor, method: str,
+        self,
+        prior,
+        likelihood_nn: nn.Module,
+        x: Tensor,
+        method: str,
+        device: Optional[Union[str, torch.device]] = None,
+        cuda_graph: bool = False,
+        compile_potential: bool = False,
     ) -> Callable:
         r"""Return potential function for posterior $p(\theta|x)$.
 
@@ -497,14 +761,50 @@ class PotentialFunctionProvider:
             x: Conditioning variable for posterior $p(\theta|x)$. Can be a batch of iid
                 x.
             method: One of `slice_np`, `slice`, `hmc` or `nuts`, `rejection`.
+            device: Device of `likelihood_nn`. If `None`, it is read off the net's
+                parameters, which requires the net to have floating point parameters,
+                e.g. unlike a fully int8-quantized net.
+            cuda_graph: Whether to capture the evaluation of the potential without
+                gradients as a CUDA graph per batch size of $\theta$ and to replay it
+                instead of launching every kernel from Python. Only used if the net
+                lives on a GPU and the prior can be evaluated there.
+            compile_potential: Whether to compile the evaluation of the potential
+                without gradients with `torch.compile(mode="reduce-overhead")` for
+                static shapes, i.e. it is compiled once per batch size of $\theta$.
+                Ignored for torch<2.0.
 
         Returns:
             Potential function for sampler.
         """
         self.likelihood_nn = likelihood_nn
         self.prior = prior
-        self.device = next(likelihood_nn.parameters()).device
-        self.x = atleast_2d(x).to(self.device)
+        self.device = (
+            torch.device(device)
+            if device is not None
+            else next(likelihood_nn.parameters()).device
+        )
+        # Made 2D and contiguous once, such that no step has to reshape or copy it.
+        self.x = atleast_2d(x).to(self.device).contiguous()
+        self._num_trials = self.x.shape[0]
+        # `x` is fixed during sampling, hence its repetition only depends on the
+        # batch size of theta. It is cached for the most recent batch size.
+        self._x_repeated = None
+        # Buffer into which theta is repeated, sized for the largest batch so far.
+        self._theta_repeated = None
+        self._prior_on_device = self._prior_evaluates_on_device()
+        # CUDA streams on which the net and the prior are evaluated concurrently.
+        # Created on first use.
+        self._streams = None
+        self._use_cuda_graph = (
+            cuda_graph and self.device.type == "cuda" and self._prior_on_device
+        )
+        # Captured graphs with their static input and output per batch size.
+        self._cuda_graphs = {}
+        # Page-locked staging buffers for numpy parameters per shape.
+        self._theta_pinned = {}
+        self._compile_potential = compile_potential and hasattr(torch, "compile")
+        # Compiled on first use.
+        self._compiled_log_posterior = None
 
         if method == "slice":
             return partial(self.pyro_potential, track_gradients=False)
@@ -513,41 +813,402 @@ class PotentialFunctionProvider:
         elif "slice_np" in method:
             return partial(self.posterior_potential, track_gradients=False)
         elif method == "rejection":
-            return partial(self.posterior_potential, track_gradients=True)
+            return self.rejection_potential
         elif method == "vi":
             return partial(self.posterior_potential, track_gradients=False)
         else:
             NotImplementedError
 
+    def clear(self) -> None:
+        """Drop the references to the net, `x` and all buffers of the potential.
+
+        The potential function can't be evaluated afterwards until the provider is
+        called again.
+        """
+        self.likelihood_nn = None
+        self.x = None
+        self._x_repeated = None
+        self._theta_repeated = None
+        self._theta_pinned = {}
+        self._streams = None
+        self._cuda_graphs = {}
+        self._compiled_log_posterior = None
+
+    def _prior_evaluates_on_device(self) -> bool:
+        """Return whether the prior can be evaluated on the (non-cpu) device of the net.
+
+        If so, the prior and the likelihood are summed on the device and only the
+        result is moved to the cpu. Otherwise, the prior is evaluated on the cpu.
+        """
+        if self.device.type == "cpu":
+            return False
+        # The probe must not advance the random number generators, such that seeded
+        # runs draw the same samples as on the cpu.
+        with torch.random.fork_rng(devices=[self.device]):
+            try:
+                theta = self.prior.sample((1,)).to(self.device)
+                return self.prior.log_prob(theta).device == self.device
+            except RuntimeError:
+                return False
+
     def log_likelihood(self, theta: Tensor, track_gradients: bool = False) -> Tensor:
         """Return log likelihood of fixed data given a batch of parameters."""
 
+        if theta.ndim != 2:
+            theta = ensure_theta_batched(theta)
+        theta = theta.to(self.device)
+
+        x_repeated, theta_repeated = self._expand(theta, track_gradients)
         log_likelihoods = LikelihoodBasedPosterior._log_likelihoods_over_trials(
             x=self.x,
-            theta=ensure_theta_batched(theta).to(self.device),
+            theta=theta,
             net=self.likelihood_nn,
             track_gradients=track_gradients,
+            x_repeated=x_repeated,
+            theta_repeated=theta_repeated,
         )
 
         return log_likelihoods
 
+    def _expand(
+        self, theta: Tensor, track_gradients: bool = False
+    ) -> Tuple[Tensor, Tensor]:
+        """Return `x` and `theta` expanded to all combinations of trials and `theta`.
+
+        `x` is laid out as AABBCC and `theta` as ABCABC, i.e. as a `(num_trials,
+        num_thetas)` grid flattened with the trials as the slow dimension. Both are
+        broadcast from stride-0 `expand` views instead of being repeated:
+
+        - a single trial of `x` is passed to the net as the view itself.
+        - for several trials, `x` is materialized once and reused as long as the
+            batch size of `theta` does not change, because it is fixed during
+            sampling.
+        - `theta` is copied into the leading part of a buffer that is overwritten in
+            every step and only reallocated when a larger batch arrives. The buffer is
+            only used without gradients, otherwise a new tensor is materialized.
+
+        Both caches hold a single tensor, such that samplers with varying batch sizes,
+        e.g. the VI slice sampler, don't accumulate memory.
+        """
+        num_thetas = theta.shape[0]
+        if self._num_trials == 1:
+            return self.x.expand(num_thetas, *self.x.shape[1:]), theta
+
+        grid_shape = (self._num_trials, num_thetas)
+        if self._x_repeated is None or self._x_repeated[0] != num_thetas:
+            self._x_repeated = (
+                num_thetas,
+                self.x.unsqueeze(1)
+                .expand(*grid_shape, *self.x.shape[1:])
+                .reshape(-1, *self.x.shape[1:]),
+            )
+
+        if track_gradients:
+            theta_repeated = (
+                theta.unsqueeze(0)
+                .expand(*grid_shape, *theta.shape[1:])
+                .reshape(-1, *theta.shape[1:])
+            )
+        else:
+            num_rows = self._num_trials * num_thetas
+            if (
+                self._theta_repeated is None
+                or self._theta_repeated.shape[0] < num_rows
+                or self._theta_repeated.dtype != theta.dtype
+            ):
+                self._theta_repeated = torch.empty(
+                    (num_rows, *theta.shape[1:]), dtype=theta.dtype, device=self.device
+                )
+            # The leading rows of the buffer are contiguous, i.e. a view of them can
+            # be filled as a grid.
+            theta_repeated = self._theta_repeated[:num_rows]
+            theta_repeated.view(*grid_shape, *theta.shape[1:]).copy_(
+                theta.unsqueeze(0).expand(*grid_shape, *theta.shape[1:])
+            )
+
+        return self._x_repeated[1], theta_repeated
+
+    def _log_likelihood_trial_batch(
+        self, theta: Tensor, track_gradients: bool = False
+    ) -> Tensor:
+        """Return unsummed log likelihoods of all trials for a batch on the device."""
+        x_repeated, theta_repeated = self._expand(theta, track_gradients)
+        return LikelihoodBasedPosterior._log_likelihood_trial_batch(
+            x=self.x,
+            theta=theta,
+            net=self.likelihood_nn,
+            track_gradients=track_gradients,
+            x_repeated=x_repeated,
+            theta_repeated=theta_repeated,
+        )
+
+    def _log_likelihood_and_prior_on_streams(
+        self, theta: Tensor, track_gradients: bool = False
+    ) -> Tuple[Tensor, Tensor]:
+        """Return trial log likelihoods and log prior, evaluated on two CUDA streams.
+
+        The net and the prior are independent, so the prior evaluation is hidden
+        behind the forward pass of the net. The current stream only waits for both
+        before the results are summed.
+        """
+        if self._streams is None:
+            self._streams = (
+                torch.cuda.Stream(self.device),
+                torch.cuda.Stream(self.device),
+            )
+        net_stream, prior_stream = self._streams
+        current_stream = torch.cuda.current_stream(self.device)
+
+        # `theta` was written on the current stream.
+        net_stream.wait_stream(current_stream)
+        prior_stream.wait_stream(current_stream)
+        with torch.cuda.stream(net_stream):
+            log_likelihood_trial_batch = self._log_likelihood_trial_batch(
+                theta, track_gradients
+            )
+        with torch.cuda.stream(prior_stream):
+            log_prior = self.prior.log_prob(theta)
+        current_stream.wait_stream(net_stream)
+        current_stream.wait_stream(prior_stream)
+
+        # Tell the caching allocator that the results are used on the current stream.
+        log_likelihood_trial_batch.record_stream(current_stream)
+        log_prior.record_stream(current_stream)
+
+        return log_likelihood_trial_batch, log_prior
+
+    def _replay_cuda_graph(self, theta: Tensor) -> Tensor:
+        """Return the log posterior of a batch on the device by replaying a CUDA graph.
+
+        The graph is captured on the first call with a given batch size. As a graph
+        replays a fixed sequence of kernels on fixed memory, `theta` is copied into the
+        static input of the graph and the static output is overwritten by the next
+        replay.
+        """
+        num_thetas = theta.shape[0]
+        if num_thetas not in self._cuda_graphs:
+            self._cuda_graphs[num_thetas] = self._capture_cuda_graph(theta)
+        graph, static_theta, static_log_posterior, _ = self._cuda_graphs[num_thetas]
+
+        static_theta.copy_(theta)
+        graph.replay()
+
+        return static_log_posterior.clone()
+
+    def _capture_cuda_graph(
+        self, theta: Tensor
+    ) -> Tuple["torch.cuda.CUDAGraph", Tensor, Tensor, Tuple]:
+        """Return a CUDA graph of the potential with its static input and output.
+
+        The last entry holds the buffers of `_expand()` that the graph reads and
+        writes, such that they stay allocated when the provider replaces them.
+        """
+        static_theta = theta.clone()
+
+        def log_posterior() -> Tensor:
+            return _sum_over_trials_and_add_prior_fn()(
+                self._log_likelihood_trial_batch(static_theta),
+                self._num_trials,
+                self.prior.log_prob(static_theta),
+            )
+
+        with torch.no_grad():
+            # Warm up on a side stream such that all buffers and caches are allocated
+            # before the capture.
+            current_stream = torch.cuda.current_stream(self.device)
+            warmup_stream = torch.cuda.Stream(self.device)
+            warmup_stream.wait_stream(current_stream)
+            with torch.cuda.stream(warmup_stream):
+                for _ in range(3):
+                    log_posterior()
+            current_stream.wait_stream(warmup_stream)
+
+            graph = torch.cuda.CUDAGraph()
+            with torch.cuda.graph(graph):
+                static_log_posterior = log_posterior()
+
+        return (
+            graph,
+            static_theta,
+            static_log_posterior,
+            (self._x_repeated, self._theta_repeated),
+        )
+
+    def _log_posterior_on_device(self, theta_on_device: Tensor) -> Tensor:
+        """Return the log posterior of a batch on the device, written to be compiled.
+
+        Plain tensor ops such that `torch.compile` can trace the net, the sum over
+        trials and the prior into one graph. If the prior can't be evaluated on the
+        device, only the summed log likelihoods are returned.
+        """
+        log_likelihood_trial_batch = self._log_likelihood_trial_batch(theta_on_device)
+        log_prior = (
+            self.prior.log_prob(theta_on_device) if self._prior_on_device else None
+        )
+        return _sum_over_trials_and_add_prior(
+            log_likelihood_trial_batch, self._num_trials, log_prior
+        )
+
+    def _evaluate_compiled(self, theta_on_device: Tensor) -> Optional[Tensor]:
+        """Return the log posterior of a batch on the device by the compiled potential.
+
+        The potential is compiled on the first call. It is traced and evaluated outside
+        of inference mode: dynamo guards on the dispatch keys of the tensors that it
+        traced, and these differ between tensors created inside and outside of
+        inference mode, e.g. for the numpy-backed buffers of mixture density nets.
+
+        Returns `None` and falls back to eager evaluation for all following calls if
+        the potential can't be compiled.
+        """
+        if self._compiled_log_posterior is None:
+            self._compiled_log_posterior = torch.compile(
+                self._log_posterior_on_device, mode="reduce-overhead", dynamic=False
+            )
+        try:
+            with torch.inference_mode(False), torch.no_grad():
+                return self._compiled_log_posterior(theta_on_device)
+        except (RuntimeError, AssertionError) as err:
+            warn(
+                f"The potential could not be compiled and is evaluated eagerly "
+                f"instead: {err}"
+            )
+            self._compile_potential = False
+            self._compiled_log_posterior = None
+            return None
+
+    def __getstate__(self) -> Dict:
+        """Return the state for pickling without CUDA streams, graphs and compilations.
+
+        None of them can be pickled, they are recreated when the potential is
+        evaluated.
+        """
+        state = self.__dict__.copy()
+        state["_streams"] = None
+        state["_cuda_graphs"] = {}
+        state["_compiled_log_posterior"] = None
+        return state
+
+    def log_posterior(self, theta: Tensor, track_gradients: bool = False) -> Tensor:
+        r"""Return unnormalized posterior log prob. for a (stacked) batch of $\theta$.
+
+        All leading dimensions of `theta`, e.g. `(num_chains, batch, dim)`, are
+        flattened such that the likelihood net is evaluated in a single forward pass
+        for all chains. The result is reshaped to the leading dimensions again.
+
+        Args:
+            theta: Parameters $\theta$ of shape `(*batch_shape, shape_of_single_theta)`.
+            track_gradients: Whether to track gradients.
+
+        Returns:
+            Posterior log probability of shape `batch_shape`, $-\infty$ if impossible
+            under prior.
+        """
+        if theta.ndim == 2:
+            # Batches of the samplers are already of shape `(batch, dim)`.
+            batch_shape = theta.shape[:1]
+        else:
+            theta = ensure_theta_batched(theta)
+            batch_shape = theta.shape[:-1]
+            theta = theta.reshape(-1, theta.shape[-1])
+
+        theta_on_device = theta.to(self.device, non_blocking=True)
+        if self._use_cuda_graph and not track_gradients:
+            try:
+                log_posterior = self._replay_cuda_graph(theta_on_device).cpu()
+                return log_posterior.reshape(batch_shape)
+            except RuntimeError as err:
+                # E.g. the net or the prior synchronize with the host.
+                warn(
+                    f"The potential could not be captured as a CUDA graph and is "
+                    f"evaluated eagerly instead: {err}"
+                )
+                self._use_cuda_graph = False
+
+        log_posterior = None
+        if self._compile_potential and not track_gradients:
+            log_posterior = self._evaluate_compiled(theta_on_device)
+
+        with torch.set_grad_enabled(track_gradients):
+            if log_posterior is None:
+                if self._prior_on_device and self.device.type == "cuda":
+                    (
+                        log_likelihood_trial_batch,
+                        log_prior,
+                    ) = self._log_likelihood_and_prior_on_streams(
+                        theta_on_device, track_gradients
+                    )
+                else:
+                    log_likelihood_trial_batch = self._log_likelihood_trial_batch(
+                        theta_on_device, track_gradients
+                    )
+                    # Stay on the device and cross to the cpu only once with the sum.
+                    log_prior = (
+                        self.prior.log_prob(theta_on_device)
+                        if self._prior_on_device
+                        else None
+                    )
+                log_posterior = _sum_over_trials_and_add_prior_fn()(
+                    log_likelihood_trial_batch, self._num_trials, log_prior
+                )
+
+            log_posterior = log_posterior.cpu()
+            if not self._prior_on_device:
+                # The prior is evaluated on the cpu, and only the sum over trials
+                # crosses from the device.
+                log_posterior = log_posterior + self.prior.log_prob(theta)
+
+        return log_posterior.reshape(batch_shape)
+
     def posterior_potential(
         self, theta: np.array, track_gradients: bool = False
     ) -> ScalarFloat:
         r"""Return posterior log prob. of theta $p(\theta|x)$"
 
         Args:
-            theta: Parameters $\theta$, batch dimension 1.
+            theta: Parameters $\theta$, batch dimension 1 or a batch of parameters,
+                e.g. one per chain of a vectorized sampler.
 
         Returns:
             Posterior log probability of the theta, $-\infty$ if impossible under prior.
         """
-        theta = torch.as_tensor(theta, dtype=torch.float32)
+        if isinstance(theta, np.ndarray) and self.device.type == "cuda":
+            theta = self._stage_in_pinned_memory(theta)
+        else:
+            theta = torch.as_tensor(theta, dtype=torch.float32)
 
         # Notice opposite sign to pyro potential.
-        return self.log_likelihood(
-            theta, track_gradients=track_gradients
-        ).cpu() + self.prior.log_prob(theta)
+        return self.log_posterior(theta, track_gradients=track_gradients)
+
+    def _stage_in_pinned_memory(self, theta: np.ndarray) -> Tensor:
+        """Return numpy `theta` copied into a reused page-locked cpu tensor.
+
+        The copy from page-locked memory to the GPU can be issued without blocking and
+        no new page-locked buffer is allocated in every step of the sampler.
+        """
+        if theta.shape not in self._theta_pinned:
+            self._theta_pinned[theta.shape] = torch.empty(
+                theta.shape, dtype=torch.float32, pin_memory=True
+            )
+        theta_pinned = self._theta_pinned[theta.shape]
+        np.copyto(theta_pinned.numpy(), theta, casting="unsafe")
+        return theta_pinned
+
+    def rejection_potential(self, theta: Tensor) -> Tensor:
+        r"""Return posterior log prob. of a batch of proposals for rejection sampling.
+
+        `rejection_sample` searches the maximum of the potential-proposal ratio by
+        gradient ascent and then accepts or rejects whole batches of proposals under
+        `torch.no_grad()`. Gradients are therefore only tracked when grad mode is
+        enabled, such that no graph is built for the proposal batches.
+
+        Args:
+            theta: Batch of parameters $\theta$ of shape
+                `(batch, shape_of_single_theta)`.
+
+        Returns:
+            Posterior log probability of shape `(batch,)`.
+        """
+        return self.posterior_potential(theta, track_gradients=torch.is_grad_enabled())
 
     def pyro_potential(
         self, theta: Dict[str, Tensor], track_gradients: bool = False
@@ -557,7 +1218,8 @@ class PotentialFunctionProvider:
          Args:
             theta: Parameters $\theta$. The tensor's shape will be
                 (1, shape_of_single_theta) if running a single chain or just
-                (shape_of_single_theta) for multiple chains.
+                (shape_of_single_theta) for multiple chains. Stacked chains of shape
+                (num_chains, shape_of_single_theta) are evaluated in one batch.
 
         Returns:
             The potential $-[\log r(x_o, \theta) + \log p(\theta)]$.
@@ -565,8 +1227,5 @@ class PotentialFunctionProvider:
 
         theta = next(iter(theta.values()))
 
-        return -(
-            self.log_likelihood(theta, track_gradients=track_gradients).cpu()
-            + self.prior.log_prob(theta)
-        )
+        return -self.log_posterior(theta, track_gradients=track_gradients)
 
@@ -195,8 +195,8 @@ class LikelihoodEstimator(NeuralInference, ABC):
             for batch in train_loader:
                 self.optimizer.zero_grad()
                 theta_batch, x_batch = (
-                    batch[0].to(self._device),
-                    batch[1].to(self._device),
+                    batch[0].to(self._device, non_blocking=True),
+                    batch[1].to(self._device, non_blocking=True),
                 )
                 # Evaluate on x with theta as context.
                 log_prob = self._neural_net.log_prob(x_batch, context=theta_batch)
@@ -216,8 +216,8 @@ class LikelihoodEstimator(NeuralInference, ABC):
             with torch.no_grad():
                 for batch in val_loader:
                     theta_batch, x_batch = (
-                        batch[0].to(self._device),
-                        batch[1].to(self._device),
+                        batch[0].to(self._device, non_blocking=True),
+                        batch[1].to(self._device, non_blocking=True),
                     )
                     # Evaluate on x with theta as context.
                     log_prob = self._neural_net.log_prob(x_batch, context=theta_batch)
@@ -256,6 +256,8 @@ class LikelihoodEstimator(NeuralInference, ABC):
         mcmc_parameters: Optional[Dict[str, Any]] = None,
         rejection_sampling_parameters: Optional[Dict[str, Any]] = None,
         vi_parameters: Optional[Dict[str, Any]] = None,
+        inference_dtype: Optional[torch.dtype] = None,
+        use_int8_sampling: bool = False,
     ) -> LikelihoodBasedPosterior:
         r"""
         Build posterior from the neural density estimator.
@@ -292,6 +294,10 @@ class LikelihoodEstimator(NeuralInference, ABC):
                 `potential_fn / proposal` ratio. `num_iter_to_find_max` as the number
                 of gradient ascent iterations to find the maximum of that ratio. `m` as
                 multiplier to that ratio.
+            inference_dtype: Reduced precision, e.g. `torch.bfloat16`, in which the
+                density estimator is evaluated during MCMC. Full precision if `None`.
+            use_int8_sampling: Whether to evaluate a dynamically int8-quantized copy
+                of the density estimator during gradient-free MCMC on the cpu.
 
         Returns:
             Posterior $p(\theta|x)$  with `.sample()` and `.log_prob()` methods
@@ -317,12 +323,14 @@ class LikelihoodEstimator(NeuralInference, ABC):
             rejection_sampling_parameters=rejection_sampling_parameters,
             vi_parameters=vi_parameters,
             device=device,
+            inference_dtype=inference_dtype,
+            use_int8_sampling=use_int8_sampling,
         )
 
         self._posterior._num_trained_rounds = self._round + 1
 
-        # Store models at end of each round.
-        self._model_bank.append(deepcopy(self._posterior))
-        self._model_bank[-1].net.eval()
+        # Store models at end of each round. The copies of their nets are kept on the
+        # cpu, such that the model bank does not grow on the GPU.
+        self._model_bank.append(self._posterior.snapshot())
 
         return deepcopy(self._posterior)
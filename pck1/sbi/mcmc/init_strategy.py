@@ -33,22 +33,27 @@ def sir(
     potential_fn: Callable,
     sir_num_batches: int = 10,
     sir_batch_size: int = 1000,
+    num_samples: int = 1,
     **kwargs: Any,
 ) -> Tensor:
-    r"""Return a sample obtained by sequential importance reweighting.
+    r"""Return samples obtained by sequential importance reweighting.
 
     This function can also do `SIR` on the conditional posterior
     $p(\theta_i|\theta_j, x)$ when a `condition` and `dims_to_sample` are passed.
 
+    All `num_samples` samples are resampled from the same set of weighted candidates,
+    such that the candidates are only drawn and evaluated once, e.g. for all chains.
+
     Args:
         prior: Prior distribution, candidate samples are drawn from it.
         potential_fn: Potential function that the candidate samples are weighted with.
             Note that the function needs to return log probabilities.
         sir_num_batches: Number of candidate batches drawn.
         sir_batch_size: Batch size used for evaluating candidates.
+        num_samples: Number of samples to return, drawn with replacement.
 
     Returns:
-        A single sample.
+        Samples of shape `(num_samples, shape_of_single_theta)`.
     """
     init_strategy_num_candidates = sir_num_batches * sir_batch_size
 
@@ -71,8 +76,8 @@ def sir(
 
         idxs = np.random.choice(
             a=np.arange(init_strategy_num_candidates),
-            size=1,
-            replace=False,
+            size=num_samples,
+            replace=True,
             p=probs,
         )
 
@@ -82,41 +82,34 @@ class SliceSamplerVectorized:
             pbar = tqdm(range(self.num_chains * num_samples))
             print("Generating MCMC samples")
 
+        # Parameters at which the log prob is evaluated next, one row per chain. Each
+        # row equals the current state of its chain except for the coordinate that is
+        # currently updated, so only that single entry is written in every step.
+        params = np.array(self.x, dtype=float)
+
         num_chains_finished = 0
         while num_chains_finished != self.num_chains:
 
             num_chains_finished = 0
 
-            for sc in self.state.values():
+            for c, sc in self.state.items():
                 if sc["state"] == "BEGIN":
                     sc["cxi"] = sc["x"][sc["order"][sc["i"]]]
                     sc["wi"] = sc["width"][sc["order"][sc["i"]]]
-                    sc["next_param"] = np.concatenate(
-                        [
-                            sc["x"][: sc["order"][sc["i"]]],
-                            [sc["cxi"]],
-                            sc["x"][sc["order"][sc["i"]] + 1 :],
-                        ]
-                    )
+                    params[c, sc["order"][sc["i"]]] = sc["cxi"]
 
-            params = np.stack([sc["next_param"] for sc in self.state.values()])
             log_probs = self._log_prob_fn(params)
 
             for c in range(self.num_chains):
                 sc = self.state[c]
+                i = sc["order"][sc["i"]]
 
                 if sc["state"] == "BEGIN":
                     # position the bracket randomly around the current sample
                     sc["logu"] = log_probs[c] + np.log(1.0 - self.rng.rand())
                     sc["lx"] = sc["cxi"] - sc["wi"] * self.rng.rand()
                     sc["ux"] = sc["lx"] + sc["wi"]
-                    sc["next_param"] = np.concatenate(
-                        [
-                            sc["x"][: sc["order"][sc["i"]]],
-                            [sc["lx"]],
-                            sc["x"][sc["order"][sc["i"]] + 1 :],
-                        ]
-                    )
+                    params[c, i] = sc["lx"]
                     sc["state"] = "LOWER"
 
                 elif sc["state"] == "LOWER":
@@ -127,22 +120,10 @@ class SliceSamplerVectorized:
 
                     if outside_lower:
                         sc["lx"] -= sc["wi"]
-                        sc["next_param"] = np.concatenate(
-                            [
-                                sc["x"][: sc["order"][sc["i"]]],
-                                [sc["lx"]],
-                                sc["x"][sc["order"][sc["i"]] + 1 :],
-                            ]
-                        )
+                        params[c, i] = sc["lx"]
 
                     else:
-                        sc["next_param"] = np.concatenate(
-                            [
-                                sc["x"][: sc["order"][sc["i"]]],
-                                [sc["ux"]],
-                                sc["x"][sc["order"][sc["i"]] + 1 :],
-                            ]
-                        )
+                        params[c, i] = sc["ux"]
                         sc["state"] = "UPPER"
 
                 elif sc["state"] == "UPPER":
@@ -153,23 +134,11 @@ class SliceSamplerVectorized:
 
                     if outside_upper:
                         sc["ux"] += sc["wi"]
-                        sc["next_param"] = np.concatenate(
-                            [
-                                sc["x"][: sc["order"][sc["i"]]],
-                                [sc["ux"]],
-                                sc["x"][sc["order"][sc["i"]] + 1 :],
-                            ]
-                        )
+                        params[c, i] = sc["ux"]
                     else:
                         # sample uniformly from bracket
                         sc["xi"] = (sc["ux"] - sc["lx"]) * self.rng.rand() + sc["lx"]
-                        sc["next_param"] = np.concatenate(
-                            [
-                                sc["x"][: sc["order"][sc["i"]]],
-                                [sc["xi"]],
-                                sc["x"][sc["order"][sc["i"]] + 1 :],
-                            ]
-                        )
+                        params[c, i] = sc["xi"]
                         sc["state"] = "SAMPLE_SLICE"
 
                 elif sc["state"] == "SAMPLE_SLICE":
@@ -182,22 +151,15 @@ class SliceSamplerVectorized:
                         else:
                             sc["ux"] = sc["xi"]
                         sc["xi"] = (sc["ux"] - sc["lx"]) * self.rng.rand() + sc["lx"]
-                        sc["next_param"] = np.concatenate(
-                            [
-                                sc["x"][: sc["order"][sc["i"]]],
-                                [sc["xi"]],
-                                sc["x"][sc["order"][sc["i"]] + 1 :],
-                            ]
-                        )
+                        params[c, i] = sc["xi"]
 
                     else:
                         if sc["t"] < num_samples:
                             sc["state"] = "BEGIN"
 
-                            sc["x"] = sc["next_param"].copy()
+                            sc["x"] = params[c].copy()
 
                             if sc["t"] <= (self.tuning):
-                                i = sc["order"][sc["i"]]
                                 sc["width"][i] += (
                                     (sc["ux"] - sc["lx"]) - sc["width"][i]
                                 ) / (sc["t"] + 1)
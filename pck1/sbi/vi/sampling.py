@@ -183,18 +183,22 @@ def independent_mh(num_samples, potential_fn, proposal, T=20, num_samples_batch=
     posterior approximation"""
     final_samples = []
     num_samples_batch = min(num_samples_batch, num_samples)
-    samples = proposal.sample((num_samples_batch,))
     sampling_steps = int(T / (int(num_samples / num_samples_batch)))
-    for t in range(T):
+    with torch.no_grad():
+        samples = proposal.sample((num_samples_batch,))
+        # The potential of the current samples is kept and only updated where a
+        # proposal is accepted, such that each step evaluates the potential once.
         potential = potential_fn(samples) - proposal.log_prob(samples)
-        new_samples = proposal.sample((num_samples_batch,))
-        new_potential = potential_fn(new_samples) - proposal.log_prob(new_samples)
-        acceptance_probability = torch.exp(new_potential - potential)
-        u = torch.rand(num_samples_batch)
-        mask = u < acceptance_probability
-        samples[mask] = new_samples[mask]
-        if ((t + 1) % sampling_steps) == 0:
-            final_samples.append(samples)
+        for t in range(T):
+            new_samples = proposal.sample((num_samples_batch,))
+            new_potential = potential_fn(new_samples) - proposal.log_prob(new_samples)
+            acceptance_probability = torch.exp(new_potential - potential)
+            u = torch.rand(num_samples_batch)
+            mask = u < acceptance_probability
+            samples = torch.where(mask.unsqueeze(-1), new_samples, samples)
+            potential = torch.where(mask, new_potential, potential)
+            if ((t + 1) % sampling_steps) == 0:
+                final_samples.append(samples)
     return torch.vstack(final_samples)
 
 
@@ -204,40 +208,44 @@ def random_direction_slice_sampler(
     """ Random direction slice sampler """
     final_samples = []
     num_samples_batch = min(num_samples_batch, num_samples)
-    samples = proposal.sample((num_samples_batch,))
     sampling_steps = int(T / (int(num_samples / num_samples_batch)))
 
-    for t in range(T):
-        potential_function = potential_fn(samples)
-        y = torch.rand(num_samples_batch) * potential_function.exp()
-
-        random_directions = torch.randn(samples.shape)
-        random_directions /= torch.linalg.norm(random_directions, dim=-1).unsqueeze(-1)
-        lb = torch.zeros((num_samples_batch,))
-        ub = torch.zeros((num_samples_batch,))
-        mask_lb = y < potential_function.exp()
-        mask_ub = mask_lb.clone()
-
-        while mask_lb.any() and mask_ub.any():
-            lb[mask_lb] -= steps
-            ub[mask_ub] += steps
-            proposed_samples_lb = (
-                samples[mask_lb, :]
-                + lb[mask_lb].unsqueeze(-1) * random_directions[mask_lb, :]
-            )
-            proposed_samples_ub = (
-                samples[mask_ub, :]
-                + ub[mask_ub].unsqueeze(-1) * random_directions[mask_ub, :]
-            )
-
-            potential_function_lb = potential_fn(proposed_samples_lb)
-            potential_function_ub = potential_fn(proposed_samples_ub)
-
-            mask_lb[mask_lb.clone()] = y[mask_lb] < potential_function_lb.exp()
-            mask_ub[mask_ub.clone()] = y[mask_ub] < potential_function_ub.exp()
-        x = torch.rand(num_samples_batch) * (ub - lb) + lb
-        samples = samples + x.unsqueeze(-1) * random_directions
-        if ((t + 1) % sampling_steps) == 0:
-            final_samples.append(samples)
+    with torch.no_grad():
+        samples = proposal.sample((num_samples_batch,))
+        for t in range(T):
+            potential_function = potential_fn(samples).exp()
+            y = torch.rand(num_samples_batch) * potential_function
+
+            random_directions = torch.randn(samples.shape)
+            random_directions /= torch.linalg.norm(
+                random_directions, dim=-1
+            ).unsqueeze(-1)
+            lb = torch.zeros((num_samples_batch,))
+            ub = torch.zeros((num_samples_batch,))
+            mask_lb = y < potential_function
+            mask_ub = mask_lb.clone()
+
+            while mask_lb.any() and mask_ub.any():
+                lb[mask_lb] -= steps
+                ub[mask_ub] += steps
+                proposed_samples_lb = (
+                    samples[mask_lb, :]
+                    + lb[mask_lb].unsqueeze(-1) * random_directions[mask_lb, :]
+                )
+                proposed_samples_ub = (
+                    samples[mask_ub, :]
+                    + ub[mask_ub].unsqueeze(-1) * random_directions[mask_ub, :]
+                )
+
+                # Evaluate both ends of the interval in a single call.
+                potential_function_lb, potential_function_ub = potential_fn(
+                    torch.cat([proposed_samples_lb, proposed_samples_ub])
+                ).split([proposed_samples_lb.shape[0], proposed_samples_ub.shape[0]])
+
+                mask_lb[mask_lb.clone()] = y[mask_lb] < potential_function_lb.exp()
+                mask_ub[mask_ub.clone()] = y[mask_ub] < potential_function_ub.exp()
+            x = torch.rand(num_samples_batch) * (ub - lb) + lb
+            samples = samples + x.unsqueeze(-1) * random_directions
+            if ((t + 1) % sampling_steps) == 0:
+                final_samples.append(samples)
     return torch.vstack(final_samples)
-
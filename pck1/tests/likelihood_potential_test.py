@@ -0,0 +1,75 @@
+# This file is part of sbi, a toolkit for simulation-based inference. sbi is licensed
+# under the Affero General Public License v3, see <https://www.gnu.org/licenses/>.
+
+from __future__ import annotations
+
+import pytest
+import torch
+from torch import ones
+
+from sbi.inference.posteriors.likelihood_based_posterior import (
+    PotentialFunctionProvider,
+)
+from sbi.utils import BoxUniform
+from sbi.utils.get_nn_models import likelihood_nn
+
+
+def _prior_and_net(model: str = "maf"):
+    torch.manual_seed(0)
+    prior = BoxUniform(-ones(2), ones(2))
+    theta = prior.sample((100,))
+    x = theta + 0.1 * torch.randn_like(theta)
+    net = likelihood_nn(model)(theta, x)
+    net.eval()
+    return prior, net
+
+
+def test_potential_caches_stay_bounded_for_varying_batch_sizes():
+    """The VI slice sampler evaluates the potential with a new batch size in almost
+    every call, which must not add a cached buffer per batch size."""
+    prior, net = _prior_and_net()
+    num_trials = 10
+    x_o = torch.randn(num_trials, 2)
+    provider = PotentialFunctionProvider()
+    potential_fn = provider(prior, net, x_o, "vi")
+
+    largest_batch_size = 0
+    with torch.no_grad():
+        for num_thetas in list(range(1, 201)) + [50, 3]:
+            theta = prior.sample((num_thetas,))
+            log_posterior = potential_fn(theta)
+            largest_batch_size = max(largest_batch_size, num_thetas)
+
+            assert log_posterior.shape == (num_thetas,)
+            # One repetition of `x` and one buffer for `theta`, sized for the largest
+            # batch so far.
+            assert provider._x_repeated[0] == num_thetas
+            assert provider._theta_repeated.shape[0] == num_trials * largest_batch_size
+
+        # The last result matches the trials evaluated one by one.
+        reference = prior.log_prob(theta) + sum(
+            net.log_prob(x_o[i : i + 1].expand(num_thetas, -1), context=theta)
+            for i in range(num_trials)
+        )
+    assert torch.allclose(log_posterior, reference, atol=1e-4)
+
+
+@pytest.mark.skipif(not hasattr(torch, "compile"), reason="Requires torch>=2.0.")
+def test_compiled_potential_of_mdn_in_inference_mode():
+    """MCMC evaluates the potential in inference mode, which the compiled potential
+    must handle also for the numpy-backed buffers of mixture density nets."""
+    prior, net = _prior_and_net("mdn")
+    x_o = torch.randn(3, 2)
+    provider = PotentialFunctionProvider()
+    potential_fn = provider(prior, net, x_o, "slice_np", compile_potential=True)
+    eager_potential_fn = PotentialFunctionProvider()(prior, net, x_o, "slice_np")
+
+    theta = prior.sample((10,)).numpy()
+    with torch.inference_mode():
+        for _ in range(3):
+            log_posterior = potential_fn(theta)
+        reference = eager_potential_fn(theta)
+
+    # The potential did not fall back to eager evaluation.
+    assert provider._compile_potential
+    assert torch.allclose(log_posterior, reference, atol=1e-4)
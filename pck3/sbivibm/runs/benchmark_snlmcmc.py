@@ -1,5 +1,6 @@
 import logging
 import math
+from contextlib import nullcontext
 from typing import Any, Dict, Optional, Tuple
 
 import torch
@@ -12,16 +13,11 @@ from sbibm.algorithms.sbi.utils import (
     wrap_simulator_fn,
 )
 
-
-from sbivibm.utils import automatic_transform
-
-import logging
-import math
-from typing import Any, Dict, Optional, Tuple
-import numpy as np
-
+from sbivibm.utils import automatic_transform, checkpoint_flow
 from sbibm.tasks.task import Task
 
+log = logging.getLogger(__name__)
+
 
 def run(
     task: Task,
@@ -47,6 +43,12 @@ def run(
     show_progress_bars: bool = True,
     z_score_x: bool = True,
     z_score_theta: bool = True,
+    device: str = "cpu",
+    num_chains: Optional[int] = None,
+    num_workers: int = 1,
+    bf16_training: bool = False,
+    compile_potential: bool = False,
+    gradient_checkpointing: bool = False,
     **kwargs,
 ) -> Tuple[list,torch.Tensor, int]:
     """Runs (S)NLE from `sbi`
@@ -66,20 +68,43 @@ def run(
         mcmc_parameters: MCMC parameters
         z_score_x: Whether to z-score x
         z_score_theta: Whether to z-score theta
+        device: Device on which the density estimator is trained and on which the
+            potential of the MCMC sampler is evaluated for all chains in one batch,
+            e.g. "cpu" or "cuda". Simulations, prior and samples stay on the cpu.
+        num_chains: Overrides the number of chains in `mcmc_parameters`, e.g. 256 to
+            make better use of the batched potential of `slice_np_vectorized`. The
+            thinning is reduced accordingly, `thin = max(1, 1000 // num_chains)`, such
+            that the chains run for about as many steps as 100 chains with thinning
+            10. The warmup steps are scaled up as the thinning shrinks, such that
+            every chain still runs `warmup_steps * thin` warmup iterations.
+        num_workers: Number of processes across which the batches of
+            `simulation_batch_size` parameters are simulated. The task simulators
+            are batched already, so each worker simulates whole batches. Has no
+            effect unless `simulation_batch_size` is smaller than the number of
+            simulations per round, otherwise the single batch is simulated in this
+            process.
+        bf16_training: Whether to train the density estimator under bfloat16
+            autocast, i.e. to run its linear layers in bfloat16 while the weights,
+            the optimizer step and the reductions stay in float32.
+        compile_potential: Whether to evaluate the MCMC potential with a
+            `torch.compile`d function, specialised to the observation and the batch
+            of chains of each round. Pays off for long chains, the compilation
+            takes some seconds per round.
+        gradient_checkpointing: Whether to recompute the activations of the flow's
+            transforms in the backward pass instead of storing them, which allows
+            for a larger `training_batch_size` at the same memory.
     Returns:
         Samples from posterior, number of simulator calls, log probability of true params if computable
     """
     assert not (num_observation is None and observation is None)
     assert not (num_observation is not None and observation is not None)
 
-    log = logging.getLogger(__name__)
-
     if num_rounds == 1:
         log.info(f"Running NLE")
         num_simulations_per_round = num_simulations
     else:
         log.info(f"Running SNLE")
-        num_simulations_per_round = math.floor(num_simulations / num_rounds)
+        num_simulations_per_round = num_simulations // num_rounds
 
     if simulation_batch_size > num_simulations_per_round:
         simulation_batch_size = num_simulations_per_round
@@ -93,7 +118,11 @@ def run(
     if observation is None:
         observation = task.get_observation(num_observation)
 
-    simulator = task.get_simulator(max_calls=num_simulations)
+    # The simulations are counted here from the returned data, not by the simulator.
+    # With `num_workers > 1`, the simulator may be called in copies in other
+    # processes, whose counts never reach this process.
+    simulator = task.get_simulator()
+    num_simulations_done = 0
 
     
     # PyTorch 1.8/1.9 compatibility
@@ -111,14 +140,39 @@ def run(
         z_score_x=z_score_x,
         z_score_theta=z_score_theta,
     )
+    if gradient_checkpointing:
+        build_density_estimator = density_estimator_fun
+        density_estimator_fun = lambda theta, x: checkpoint_flow(
+            build_density_estimator(theta, x)
+        )
     inference_method = inference.SNLE_A(
         density_estimator=density_estimator_fun,
         prior=prior,
+        device=device,
     )
 
     posteriors = []
     proposal = prior
+    mcmc_parameters = dict(mcmc_parameters)
     mcmc_parameters["warmup_steps"] = 25
+    if num_chains is not None:
+        # The samplers warm up for `warmup_steps * thin` iterations, which is kept
+        # fixed. Fewer iterations would also fall below the tuning steps of the
+        # vectorized slice sampler.
+        warmup_iterations = mcmc_parameters["warmup_steps"] * mcmc_parameters.get(
+            "thin", 10
+        )
+        thin = max(1, 10 * 100 // num_chains)
+        mcmc_parameters["num_chains"] = num_chains
+        mcmc_parameters["thin"] = thin
+        mcmc_parameters["warmup_steps"] = math.ceil(warmup_iterations / thin)
+    if compile_potential:
+        mcmc_parameters["compile_potential"] = True
+    # Batches are gathered into page-locked memory, such that their upload to the
+    # GPU does not block the training loop.
+    dataloader_kwargs = (
+        {"pin_memory": True} if torch.device(device).type == "cuda" else None
+    )
 
     for r in range(num_rounds):
         theta, x = inference.simulate_for_sbi(
@@ -126,37 +180,61 @@ def run(
             proposal,
             num_simulations=num_simulations_per_round,
             simulation_batch_size=simulation_batch_size,
+            num_workers=num_workers,
         )
+        num_simulations_done += x.shape[0]
 
-        density_estimator = inference_method.append_simulations(
-            theta, x, from_round=r
-        ).train(
-            training_batch_size=training_batch_size,
-            retrain_from_scratch_each_round=False,
-            discard_prior_samples=False,
-            show_train_summary=show_progress_bars,
+        training_precision = (
+            torch.autocast(device_type=torch.device(device).type, dtype=torch.bfloat16)
+            if bf16_training
+            else nullcontext()
         )
-        if r > 1:
-            mcmc_parameters["init_strategy"] = "latest_sample"
+        with training_precision:
+            density_estimator = inference_method.append_simulations(
+                theta, x, from_round=r
+            ).train(
+                training_batch_size=training_batch_size,
+                retrain_from_scratch_each_round=False,
+                discard_prior_samples=False,
+                show_train_summary=show_progress_bars,
+                dataloader_kwargs=dataloader_kwargs,
+            )
         posterior = inference_method.build_posterior(
             density_estimator, mcmc_method=mcmc_method, mcmc_parameters=mcmc_parameters
         )
         # Copy hyperparameters, e.g., mcmc_init_samples for "latest_sample" strategy.
         if r > 0:
             posterior.copy_hyperparameters_from(posteriors[-1])
+            # Continue the chains where the previous round's proposal stopped instead
+            # of running SIR again. Set after copying, which overwrites the MCMC
+            # parameters with those of the previous posterior.
+            if posterior._mcmc_init_params is not None:
+                posterior.set_mcmc_parameters(
+                    dict(posterior.mcmc_parameters, init_strategy="latest_sample")
+                )
         proposal = posterior.set_default_x(observation)
         posteriors.append(posterior)
 
+    # Do not run more chains than samples are drawn in the end.
+    if posteriors[-1].mcmc_parameters.get("num_chains", 1) > num_samples:
+        posteriors[-1].set_mcmc_parameters(
+            dict(posteriors[-1].mcmc_parameters, num_chains=num_samples)
+        )
+
+    # Only the last posterior is sampled from and stored, the posteriors of earlier
+    # rounds are returned in the transformed space.
     if automatic_transforms_enabled:
-        for i in range(len(posteriors)):
-            posteriors[i] = wrap_posterior(posteriors[i], transforms)
+        posteriors[-1] = wrap_posterior(posteriors[-1], transforms)
 
 
-    assert simulator.num_simulations == num_simulations
+    assert num_simulations_done == num_simulations
 
-    samples = posteriors[-1].sample((num_samples,)).detach()
+    # Gradient based samplers need autograd for the potential. The gradient-free
+    # samplers run in inference mode within `sample()` and return regular tensors.
+    with torch.set_grad_enabled(mcmc_method in ("hmc", "nuts")):
+        samples = posteriors[-1].sample((num_samples,)).detach()
 
-    return posteriors, samples, simulator.num_simulations
+    return posteriors, samples, num_simulations_done
 
 
 
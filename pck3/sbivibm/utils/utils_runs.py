@@ -1,12 +1,24 @@
 from sbibm.algorithms.sbi.utils import wrap_simulator_fn
 
+from contextlib import contextmanager
+from functools import lru_cache
+
 import torch 
+from nflows.transforms.autoregressive import AutoregressiveTransform
+from nflows.transforms.coupling import CouplingTransform
 from sbibm.tasks.task import Task
+from torch import nn
 from torch.distributions import Transform, Distribution
+from torch.nn.modules.batchnorm import _BatchNorm
+from torch.utils.checkpoint import checkpoint
 
+@lru_cache(maxsize=32)
 def automatic_transform(task:Task):
     """Gives a transform that bijects from the support of the prior to the real (unconstrainted) domain
 
+    The transform is cached per task instance, such that repeated runs on the same task
+    reuse it instead of rebuilding the prior.
+
     Args:
         task (Task): Sbibm task
 
@@ -90,4 +102,74 @@ def wrap_posterior(posterior, transform):
     new_q = torch.distributions.TransformedDistribution(posterior._q, transform.inv)
     posterior._q = new_q 
     posterior.net = LikelihoodWrapper(posterior.net, transform)
-    return posterior
\ No newline at end of file
+    return posterior
+
+
+@contextmanager
+def _frozen_batch_norm_stats(module: nn.Module):
+    """Restores the running statistics of all batch norm layers in `module`, i.e.
+    their running means, variances and numbers of tracked batches, on exit."""
+    buffers = [
+        b for m in module.modules() if isinstance(m, _BatchNorm) for b in m.buffers()
+    ]
+    saved = [b.clone() for b in buffers]
+    try:
+        yield
+    finally:
+        with torch.no_grad():
+            for b, value in zip(buffers, saved):
+                b.copy_(value)
+
+
+class CheckpointedTransform(nn.Module):
+    """Nflows transform that recomputes its activations in the backward pass.
+
+    During training, the activations of the wrapped transform are not stored but
+    recomputed with `torch.utils.checkpoint`, which trades compute for memory. The
+    recomputation leaves the running statistics of batch norm layers, including
+    their numbers of tracked batches, as they were after the forward pass. Evaluation
+    and the inverse are passed through unchanged.
+    """
+
+    def __init__(self, transform: nn.Module):
+        super().__init__()
+        self.transform = transform
+
+    def forward(self, inputs, context=None):
+        if not (self.training and torch.is_grad_enabled()):
+            return self.transform(inputs, context)
+
+        recomputing = False
+
+        def run(inputs, context):
+            nonlocal recomputing
+            if recomputing:
+                with _frozen_batch_norm_stats(self.transform):
+                    return self.transform(inputs, context)
+            recomputing = True
+            return self.transform(inputs, context)
+
+        return checkpoint(run, inputs, context, use_reentrant=False)
+
+    def inverse(self, inputs, context=None):
+        return self.transform.inverse(inputs, context)
+
+
+def checkpoint_flow(net: nn.Module) -> nn.Module:
+    """Wraps the autoregressive and coupling transforms of a flow into
+    `CheckpointedTransform`s.
+
+    Args:
+        net (nn.Module): Nflows flow, e.g. built by `likelihood_nn("maf")`. Nets
+            without such transforms, e.g. mixture density networks, are returned
+            unchanged.
+
+    Returns:
+        nn.Module: The same net, with its transforms wrapped in place.
+    """
+    for module in list(net.modules()):
+        if isinstance(module, nn.ModuleList):
+            for i, transform in enumerate(module):
+                if isinstance(transform, (AutoregressiveTransform, CouplingTransform)):
+                    module[i] = CheckpointedTransform(transform)
+    return net